@@ -0,0 +1,219 @@
+import bisect
+
+import ttable
+from ttable import ATTR_MASK, TABLE_MASK, page_attr_mask, table_attr_mask
+from utils import format_highlight, format_hex
+
+# AP[2] - if set the mapping is read-only at every EL.
+AP_RO = 0x80
+# APTable[1] - if set, subsequent lookup levels are read-only.
+APTABLE_RO = 0x4000000000000000
+
+# Table attribute -> page attribute it forces in all subsequent levels.
+inherited_attr = (
+    (table_attr_mask["NSTable"], page_attr_mask["NS"]),
+    (table_attr_mask["UXN"],     page_attr_mask["UXN"]),
+    (table_attr_mask["PXN"],     page_attr_mask["PXN"]),
+    (APTABLE_RO,                 AP_RO),
+)
+
+
+class Mapping:
+    """ Coalesced range of page/block descriptors with identical effective attributes. """
+    def __init__(self, vbase, vend, pbase, pend, attr):
+        self.vbase      = vbase
+        self.vend       = vend
+        self.pbase      = pbase
+        self.pend       = pend
+        self.attr       = attr
+
+class Violation:
+    """ A mapping that breaks an audit rule. `alias` holds the (base, end)
+    physical range the mapping conflicts with, if the rule has one. """
+    def __init__(self, rule, mapping, reason, alias = None):
+        self.rule       = rule
+        self.mapping    = mapping
+        self.reason     = reason
+        self.alias      = alias
+
+    def to_str(self):
+        m = self.mapping
+        return (format_highlight("[" + self.rule + "] ") +
+                format_highlight("Virtual Addr: ") +
+                format_hex(m.vbase) + " - " + format_hex(m.vend) +
+                format_highlight(" Physical Addr: ") +
+                format_hex(m.pbase) + " - " + format_hex(m.pend) +
+                format_highlight(" Attributes: ") + format_hex(m.attr) +
+                " " + self.reason)
+
+
+# Rules
+class Rule:
+    """ Base class of all audit rules. `check` is called once per mapping,
+    `finish` once after the last mapping was seen. """
+    name = ""
+
+    def check(self, m):
+        return None
+
+    def finish(self):
+        return []
+
+class WXRule(Rule):
+    """ No mapping may be writable and executable at the same time. """
+    name = "W+X"
+    XN = page_attr_mask["UXN"] | page_attr_mask["PXN"]
+
+    def check(self, m):
+        if ((m.attr & AP_RO) == 0 and (m.attr & WXRule.XN) != WXRule.XN):
+            return Violation(self.name, m, "writable and executable")
+        return None
+
+class DeviceXNRule(Rule):
+    """ Device memory must be UXN and PXN. Needs the value of MAIR_EL1. """
+    name = "DEVICE-XN"
+    XN = page_attr_mask["UXN"] | page_attr_mask["PXN"]
+
+    def __init__(self, mair):
+        # Device memory has the upper nibble of its MAIR attribute cleared.
+        self.device_idx = [((mair >> (8 * i)) & 0xf0) == 0 for i in range(8)]
+
+    def check(self, m):
+        attr_idx = (m.attr & page_attr_mask["ATTRIDX"]) >> 2
+        if (self.device_idx[attr_idx] and (m.attr & DeviceXNRule.XN) != DeviceXNRule.XN):
+            return Violation(self.name, m, "device memory (AttrIdx: {idx}) is executable"
+                    .format(idx = attr_idx))
+        return None
+
+class NSAliasRule(Rule):
+    """ Physical memory mapped secure must not also be mapped non-secure.
+
+    `secure_ranges` optionally adds (base, end) physical ranges known to be
+    secure RAM, whether or not they are mapped by the audited table. """
+    name = "NS-ALIAS"
+
+    def __init__(self, secure_ranges = None):
+        self.secure_ranges = list(secure_ranges) if secure_ranges != None else []
+        self.secure = list(self.secure_ranges)
+        self.nonsecure = []
+
+    def check(self, m):
+        if ((m.attr & page_attr_mask["NS"]) != 0):
+            self.nonsecure.append(m)
+        else:
+            self.secure.append((m.pbase, m.pend))
+        return None
+
+    def finish(self):
+        secure, nonsecure = self.secure, self.nonsecure
+        self.secure = list(self.secure_ranges)
+        self.nonsecure = []
+
+        # Sort by base and keep the running maximum of the ends, so the
+        # backwards scan below can stop at the first range that can't overlap.
+        secure.sort()
+        starts = [b for (b, e) in secure]
+        max_end = []
+        for (b, e) in secure:
+            max_end.append(max(e, max_end[-1]) if max_end else e)
+
+        violations = []
+
+        for m in nonsecure:
+            i = bisect.bisect_right(starts, m.pend) - 1
+            hits = []
+            while (i >= 0 and max_end[i] >= m.pbase):
+                (b, e) = secure[i]
+                if (e >= m.pbase):
+                    hits.append((max(b, m.pbase), min(e, m.pend)))
+                i -= 1
+
+            for alias in reversed(hits):
+                violations.append(Violation(self.name, m,
+                        "aliases secure physical memory {b} - {e}"
+                        .format(b = hex(alias[0]), e = hex(alias[1])), alias))
+
+        return violations
+
+
+def default_rules(mair):
+    """ Return the built-in rules. DEVICE-XN is left out if `mair` is None. """
+    rules = [WXRule(), NSAliasRule()]
+    if (mair != None):
+        rules.append(DeviceXNRule(mair))
+    return rules
+
+
+# Walker
+def is_valid(desc, lvl):
+    if (lvl == 3):
+        return (desc & 0x3) == 0x3
+    return (desc & 0x1) == 0x1
+
+def iter_mappings(table):
+    """ Yield the mappings of `table` in ascending virtual address order.
+
+    Attributes inherited from table descriptors are folded into every page and
+    block. Neighbours are merged if they are virtually and physically
+    contiguous and have the same effective attributes. Invalid descriptors
+    (valid bit clear, or reserved `0b01` at level 3) are treated as holes. """
+    run = None
+    # Explicit stack of (entries, index, level, inherited attributes).
+    stack = [(table.entries, 0, table.lvl, 0)]
+
+    while stack:
+        entries, i, lvl, inherit = stack.pop()
+        if (i >= len(entries)):
+            continue
+
+        stack.append((entries, i + 1, lvl, inherit))
+        e = entries[i]
+
+        if (not is_valid(e.descriptor, lvl)):
+            if (run != None):
+                yield run
+                run = None
+            continue
+
+        if (isinstance(e, ttable.Table)):
+            tattr = e.descriptor & ~ATTR_MASK
+            nxt = inherit
+            for (tmask, pmask) in inherited_attr:
+                if (tattr & tmask):
+                    nxt |= pmask
+            stack.append((e.entries, 0, e.lvl, nxt))
+
+        elif (isinstance(e, ttable.Block)):
+            # Type bits [1:0] differ between blocks and pages, ignore them.
+            attr = (e.descriptor & ~(ATTR_MASK | TABLE_MASK)) | inherit
+            if (run != None and run.attr == attr and
+                    run.vend + 1 == e.vbase and run.pend + 1 == e.pbase):
+                run.vend = e.vend
+                run.pend = e.pend
+            else:
+                if (run != None):
+                    yield run
+                run = Mapping(e.vbase, e.vend, e.pbase, e.pend, attr)
+
+    if (run != None):
+        yield run
+
+def audit(table, mair, rules = None):
+    """ Check all `rules` against the mappings of `table` in a single pass.
+    Return the list of violations. """
+    if (rules == None):
+        rules = default_rules(mair)
+
+    violations = []
+    checks = [r.check for r in rules]
+
+    for m in iter_mappings(table):
+        for check in checks:
+            v = check(m)
+            if (v != None):
+                violations.append(v)
+
+    for r in rules:
+        violations.extend(r.finish())
+
+    return violations
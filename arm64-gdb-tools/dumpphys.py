@@ -0,0 +1,81 @@
+import gdb
+import argparse
+import time
+import logging
+logger = logging.getLogger("vmmap")
+
+import openocd
+from utils import *
+
+class DumpPhys(gdb.Command):
+    """Dump physical memory to a file (OpenOcd)."""
+
+    def __init__ (self):
+        super (DumpPhys, self).__init__ ("dump-phys", gdb.COMMAND_USER)
+        self.ocd = None
+        self.parser = argparse.ArgumentParser(prog='dump-phys',
+                                    description='Dump physical memory to a file.')
+        self.parser.add_argument('addr',
+                                    help='Physical start address (hex).')
+        self.parser.add_argument('size',
+                                    help='Number of bytes to read (hex). Must be 8 byte aligned.')
+        self.parser.add_argument('file',
+                                    help='Output file.')
+        gdb.events.exited.connect(self.ocd_disconnect)
+
+    def ocd_disconnect(self, event = None):
+        if (self.ocd is None):
+            return
+
+        try:
+            self.ocd.disconnect()
+        except OSError as error:
+            logger.debug(error)
+        finally:
+            self.ocd = None
+
+    def invoke(self, arg, from_tty):
+        args = gdb.string_to_argv(arg)
+        try:
+            pargs = self.parser.parse_args(args)
+            addr = parse_hex(pargs.addr)
+            size = parse_hex(pargs.size)
+
+            if (self.ocd is None):
+                ocd = openocd.OpenOcd()
+                try:
+                    ocd.connect()
+                except OSError as error:
+                    ocd.sock.close()
+                    print(error)
+                    raise SystemExit
+                self.ocd = ocd
+
+            start = time.perf_counter()
+            try:
+                mem = self.ocd.read_phys_memory_bulk(addr, size)
+            except ValueError as error:
+                print(error)
+                raise SystemExit
+            except OSError as error:
+                # Connection is broken. Reconnect on next invocation.
+                print(error)
+                self.ocd_disconnect()
+                raise SystemExit
+            elapsed = time.perf_counter() - start
+
+            try:
+                with open(pargs.file, "wb") as f:
+                    f.write(mem)
+            except OSError as error:
+                print(error)
+                raise SystemExit
+
+            print("Read {size} bytes from {addr} in {t:.2f}s ({rate:.2f} MB/s) -> {file}"
+                    .format(size = hex(size), addr = format_hex(addr), t = elapsed,
+                            rate = (size / 1e6) / elapsed if elapsed > 0 else 0,
+                            file = pargs.file))
+
+        # Catch SystemExit here so errors won't close active gdb session
+        except SystemExit:
+            pass
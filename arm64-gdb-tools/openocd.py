@@ -1,11 +1,22 @@
 import socket
+import sys
+from array import array
+
+class OpenOcdError(ValueError):
+    """OpenOcd answered with something other than the expected data."""
+    pass
 
 class OpenOcd:
     COMMAND_TOKEN = '\x1a'
+    # Return `read_memory` words as one string of fixed width hex digits.
+    READ_HEX_CMD = ("set r {}; foreach w [read_memory 0x%x %d %d phys] "
+                    "{append r [format %%0%dlx $w]}; set r")
     def __init__(self, verbose=False):
         self.tclRpcIp       = "127.0.0.1"
         self.tclRpcPort     = 6666
         self.bufferSize     = 4096
+        # Number of words requested per `read_memory` call.
+        self.bulkWords      = 8192
 
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
@@ -27,7 +38,7 @@ class OpenOcd:
 
     def _recv(self):
         """Read from the stream until the token (\x1a) was received."""
-        data = bytes()
+        data = bytearray()
         while True:
             chunk = self.sock.recv(self.bufferSize)
             data += chunk
@@ -40,9 +51,68 @@ class OpenOcd:
         return data
         
     def _mrs(self, cr0, cr1, crn, crm, op2):
-    	output = self.send("aarch64 mrs {} {} {} {} {}".format(cr0, cr1, crn, crm, op2))
+        output = self.send("aarch64 mrs {} {} {} {} {}".format(cr0, cr1, crn, crm, op2))
         return (output.split(": ")[1]).strip()
 
+    def _read_phys_chunk(self, wordLen, address, n):
+        """Read `n` words of physical memory. Return them as big endian bytes.
+
+        OpenOcd's Tcl interpreter formats every word as fixed width hex, so the
+        reply is a single hex string decoded by one `bytes.fromhex` call."""
+        output = self.send(OpenOcd.READ_HEX_CMD % (address, wordLen, n, wordLen // 4))
+
+        try:
+            raw = bytes.fromhex(output)
+        except ValueError:
+            raise OpenOcdError("read_memory 0x%x failed: %s" % (address, output[:80]))
+
+        if (len(raw) != n * wordLen // 8):
+            raise OpenOcdError("read_memory 0x%x returned %d of %d bytes"
+                    % (address, len(raw), n * wordLen // 8))
+
+        return raw
+
     def read_phys_memory(self, wordLen, address, n):
-        output = self.send("read_memory 0x%x %d %d phys" % (address, wordLen, n))
-        return map(lambda x: int(x, 16), output.split(" "))
\ No newline at end of file
+        """Read `n` words of `wordLen` bits of physical memory starting at `address`.
+
+        The region is fetched in chunks of `bulkWords` words. Return the
+        decoded words as an `array` in native byte order."""
+        words = array({8 : 'B', 16 : 'H', 32 : 'I', 64 : 'Q'}[wordLen])
+        step = wordLen // 8
+        done = 0
+
+        while (done < n):
+            cnt = min(self.bulkWords, n - done)
+            words.frombytes(self._read_phys_chunk(wordLen, address + done * step, cnt))
+            done += cnt
+
+        if (sys.byteorder == "little"):
+            words.byteswap()
+
+        return words
+
+    def read_phys_memory_bulk(self, address, size):
+        """Read `size` bytes of physical memory starting at `address`.
+
+        Return a single little endian `bytearray`. `address` and `size` must
+        be 8 byte aligned."""
+        if (size <= 0):
+            raise ValueError("Size must be greater than zero.")
+
+        if (address % 8 != 0 or size % 8 != 0):
+            raise ValueError("Bulk reads must be 8 byte aligned.")
+
+        buf = bytearray(size)
+        view = memoryview(buf)
+        offset = 0
+
+        while (offset < size):
+            cnt = min(self.bulkWords, (size - offset) // 8)
+            # Words arrive big endian, reverse each one to get the memory image.
+            words = array('Q')
+            words.frombytes(self._read_phys_chunk(64, address + offset, cnt))
+            words.byteswap()
+            view[offset:offset + cnt * 8] = memoryview(words).cast('B')
+            offset += cnt * 8
+
+        return buf
@@ -6,6 +6,7 @@ import struct
 logger = logging.getLogger("vmmap")
 
 import ttable
+import audit
 import openocd
 from sysregs import sysregs
 from utils import *
@@ -49,6 +50,8 @@ class VMMAP(gdb.Command):
                                     help='Print mapping at address.')
         showgrp.add_argument('-s', '--symbol',
                                     help='Print mapping of symbol.')
+        showgrp.add_argument('-au', '--audit', action='store_true',
+                                    help='Check mappings against security rules (W+X, device XN, NS aliasing).')
         self.parser.add_argument('-c', '--clear', action='store_true',
                                     help='Clear cached values.')
 
@@ -121,8 +124,12 @@ class VMMAP(gdb.Command):
                     print("First lvl Table: " + self.entry_arg)
 
                 lvlidx = [0,0,0,0]
-                self.table = ttable.parse_descriptor(
-                        self.entry, lvlidx, pargs.level - 1 , None, self.read_mem, True)
+                try:
+                    self.table = ttable.parse_descriptor(
+                            self.entry, lvlidx, pargs.level - 1 , None, self.read_mem, True)
+                except (openocd.OpenOcdError, OSError) as error:
+                    print(error)
+                    raise SystemExit
                 self.isInit = True
 
             if (pargs.addr):
@@ -137,6 +144,8 @@ class VMMAP(gdb.Command):
                 logger.debug("Parsed expression:")
                 logger.debug(sym)
                 self.print_mapping_at(str(sym))
+            elif (pargs.audit):
+                self.print_audit()
             else:
                 self.table.print_(
                         self.mair,
@@ -162,3 +171,13 @@ class VMMAP(gdb.Command):
             else:
                 print("No mapping!")
 
+    def print_audit(self):
+            if (self.mair is None):
+                print("MAIR not given. Device memory rule (DEVICE-XN) skipped...")
+
+            violations = audit.audit(self.table, self.mair)
+
+            for v in violations:
+                print(v.to_str())
+
+            print("{n} violation(s) found.".format(n = len(violations)))
@@ -4,6 +4,8 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)) + '/arm64-gdb-tool
 
 from vmmap import VMMAP
 from sysregs import Sysregs
+from dumpphys import DumpPhys
 
 VMMAP()
 Sysregs()
+DumpPhys()